@@ -9,100 +9,336 @@ Usage:
 """
 
 import argparse
+import io
 import json
+import os
 import re
 import sys
+import tempfile
 import urllib.request
-import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import partial
 from html import unescape
+from operator import itemgetter
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Iterable, Iterator, Optional
+
+try:
+    from lxml import etree as ET
+
+    HAS_LXML = True
+except ImportError:
+    import xml.etree.ElementTree as ET
+
+    HAS_LXML = False
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    # Shared session so every category reuses the keep-alive connection
+    _SESSION = requests.Session()
+    _SESSION.mount("https://", HTTPAdapter(pool_connections=8, pool_maxsize=8))
+except ImportError:
+    _SESSION = None
+
+_WS_RE = re.compile(r"\s+")
+# arXiv RSS updates once a day, so feeds are cached per date
+CACHE_DIR = Path.home() / ".cache" / "arxiv-review"
+
+# arXiv RSS puts authors in the Dublin Core namespace
+DC_CREATOR = "{http://purl.org/dc/elements/1.1/}creator"
+
+# arXiv API returns Atom; used to fetch several categories in one request
+API_URL = "https://export.arxiv.org/api/query"
+ATOM = "{http://www.w3.org/2005/Atom}"
+ARXIV_PRIMARY = "{http://arxiv.org/schemas/atom}primary_category"
+# Root tags of responses worth caching (RSS feed, API Atom feed)
+FEED_ROOTS = frozenset({"rss", f"{ATOM}feed"})
+
+# Canonical link prefixes that extract_arxiv_id can slice without a regex
+_ID_PREFIXES = frozenset(
+    f"{scheme}://arxiv.org/{kind}"
+    for scheme in ("http", "https")
+    for kind in ("abs", "pdf")
+)
+# Handle both /abs/ and /pdf/ URLs
+_ID_RE = re.compile(r"arxiv\.org/(?:abs|pdf)/([0-9]+\.[0-9]+)")
+# Title often has format "Title. (arXiv:XXXX.XXXXX ...)"
+_ARXIV_SUFFIX_RE = re.compile(r"\s*\(arXiv:[^)]+\)\s*$")
+
+
+def download(url: str) -> bytes:
+    """Download raw response bytes for a URL."""
+    if _SESSION is not None:
+        response = _SESSION.get(url, timeout=30)
+        response.raise_for_status()
+        return response.content
+    with urllib.request.urlopen(url, timeout=30) as response:
+        return response.read()
+
+
+def fetch_parsed(
+    url: str,
+    name: str,
+    parse: Callable[[bytes], Iterable[dict]],
+    use_cache: bool = True,
+) -> list[dict]:
+    """Fetch and parse a feed, reusing today's cached copy saved under `name`.
+
+    Only bodies that parse as a feed are cached, so a bad 200 response
+    (maintenance page, truncated body) is not replayed on later runs. A cached
+    copy that isn't a valid feed is discarded and downloaded again. The cache
+    is best effort: if it can't be read or written, the fetch still succeeds.
+    """
+    cache = CACHE_DIR / datetime.now().strftime("%Y-%m-%d") / f"{name}.xml"
+    if use_cache:
+        try:
+            cached = cache.read_bytes()
+        except OSError:
+            cached = None
+        if cached is not None:
+            try:
+                check_feed(cached)
+                return list(parse(cached))
+            except (ET.ParseError, ValueError):
+                try:
+                    cache.unlink(missing_ok=True)
+                except OSError:
+                    pass
+
+    content = download(url)
+    # Validate and materialize so errors surface before anything is cached
+    check_feed(content)
+    papers = list(parse(content))
+    if use_cache:
+        write_cache(cache, content)
+    return papers
+
 
+def check_feed(content: bytes) -> None:
+    """Raise ValueError unless the document root is an RSS or Atom feed."""
+    _, root = next(ET.iterparse(io.BytesIO(content), events=("start",)))
+    if root.tag not in FEED_ROOTS:
+        raise ValueError(f"response is not a feed (root element <{root.tag}>)")
 
-def fetch_rss(category: str) -> str:
-    """Fetch RSS feed for a category."""
+
+def write_cache(cache: Path, content: bytes) -> None:
+    """Atomically store content at cache, warning instead of failing."""
+    tmp_name = None
+    try:
+        cache.parent.mkdir(parents=True, exist_ok=True)
+        # Unique temp file + rename: concurrent writers (threads, a cron run
+        # and a manual fetch) never clobber each other or leave a partial feed
+        with tempfile.NamedTemporaryFile(
+            dir=cache.parent, suffix=".tmp", delete=False
+        ) as tmp:
+            tmp_name = tmp.name
+            tmp.write(content)
+        os.replace(tmp_name, cache)
+    except OSError as e:
+        print(f"Warning: Could not cache {cache.name}: {e}", file=sys.stderr)
+        if tmp_name is not None:
+            Path(tmp_name).unlink(missing_ok=True)
+
+
+def rss_url(category: str) -> str:
     # arXiv RSS provides new submissions from the previous day
-    url = f"https://rss.arxiv.org/rss/{category}"
-    with urllib.request.urlopen(url, timeout=30) as response:
-        return response.read().decode("utf-8")
+    return f"https://rss.arxiv.org/rss/{category}"
+
+
+def api_url(categories: list[str]) -> str:
+    """Query URL for the latest submissions in all categories at once."""
+    query = "+OR+".join(f"cat:{c}" for c in categories)
+    return (
+        f"{API_URL}?search_query={query}"
+        "&start=0&max_results=1000&sortBy=submittedDate&sortOrder=descending"
+    )
+
+
+def _strip_tags(text: str) -> str:
+    """Remove <...> tags with plain str.find scans (same rules as <[^>]+>)."""
+    parts = []
+    i = 0
+    while True:
+        lt = text.find("<", i)
+        if lt < 0:
+            parts.append(text[i:])
+            break
+        gt = text.find(">", lt + 1)
+        if gt < 0:
+            # Unclosed "<" is kept as literal text
+            parts.append(text[i:])
+            break
+        if gt == lt + 1:
+            # "<>" is not a tag
+            parts.append(text[i : lt + 1])
+            i = lt + 1
+            continue
+        parts.append(text[i:lt])
+        i = gt + 1
+    return "".join(parts)
 
 
 def clean_text(text: str) -> str:
     """Clean HTML entities and normalize whitespace."""
     if not text:
         return ""
-    text = unescape(text)
-    text = re.sub(r"<[^>]+>", "", text)  # Remove HTML tags
-    text = re.sub(r"\s+", " ", text).strip()
-    return text
+    text = unescape(text)  # Returns early itself when there is no "&"
+    # Most titles have no tags; skip the scan-and-join in that case
+    if "<" in text:
+        text = _strip_tags(text)
+    return _WS_RE.sub(" ", text).strip()
 
 
 def extract_arxiv_id(link: str) -> str:
     """Extract arXiv ID from URL."""
-    # Handle both /abs/ and /pdf/ URLs
-    match = re.search(r"arxiv.org/(?:abs|pdf)/([0-9]+\.[0-9]+)", link)
+    # Fast path for plain https://arxiv.org/abs/2401.12345[vN] links
+    prefix, _, tail = link.rpartition("/")
+    if prefix in _ID_PREFIXES:
+        if tail.endswith(".pdf"):
+            tail = tail[:-4]
+        tail = tail.partition("v")[0]  # Drop version suffix
+        head, dot, number = tail.partition(".")
+        if dot and head.isdigit() and number.isdigit() and tail.isascii():
+            return tail
+    # Anything unusual goes through the regex
+    match = _ID_RE.search(link)
     return match.group(1) if match else ""
 
 
-def parse_rss(xml_content: str, category: str) -> list[dict]:
-    """Parse RSS XML into list of paper dicts."""
-    papers = []
-    root = ET.fromstring(xml_content)
-
-    # Handle namespaces - arXiv RSS uses default namespace
-    ns = {"dc": "http://purl.org/dc/elements/1.1/"}
-
-    for item in root.findall(".//item"):
-        title_elem = item.find("title")
-        link_elem = item.find("link")
-        desc_elem = item.find("description")
-        creator_elem = item.find("dc:creator", ns)
-
-        if title_elem is None or link_elem is None:
+def iter_items(
+    xml_content: bytes, tag: str = "item", parent_tag: str = "channel"
+) -> Iterator:
+    """Stream `tag` elements, freeing each one once the caller is done with it."""
+    source = io.BytesIO(xml_content)
+    if HAS_LXML:
+        for _, item in ET.iterparse(source, events=("end",), tag=tag):
+            yield item
+            item.clear()
+            # Drop already-processed siblings so the tree never grows
+            while item.getprevious() is not None:
+                del item.getparent()[0]
+    else:
+        parent = None
+        for event, elem in ET.iterparse(source, events=("start", "end")):
+            if event == "start":
+                if elem.tag == parent_tag:
+                    parent = elem
+            elif elem.tag == tag:
+                yield elem
+                if parent is not None:
+                    parent.remove(elem)
+                elem.clear()
+
+
+def parse_rss(xml_content: bytes, category: str) -> Iterator[dict]:
+    """Parse RSS XML, yielding one paper dict per item."""
+    for item in iter_items(xml_content):
+        # Single walk over the children instead of one find() per field;
+        # setdefault keeps the first occurrence, like find() did
+        fields = {}
+        for child in item:
+            fields.setdefault(child.tag, child.text)
+
+        if "title" not in fields or "link" not in fields:
             continue
 
-        arxiv_id = extract_arxiv_id(link_elem.text or "")
+        arxiv_id = extract_arxiv_id(fields["link"] or "")
         if not arxiv_id:
             continue
 
-        # Title often has format "Title. (arXiv:XXXX.XXXXX ...)"
-        title = clean_text(title_elem.text or "")
-        title = re.sub(r"\s*\(arXiv:[^)]+\)\s*$", "", title)
+        title = clean_text(fields["title"] or "")
+        title = _ARXIV_SUFFIX_RE.sub("", title)
 
         # Description contains abstract + author list
-        description = clean_text(desc_elem.text or "") if desc_elem is not None else ""
+        description = clean_text(fields.get("description") or "")
 
         # Extract authors from dc:creator or description
-        authors = ""
-        if creator_elem is not None and creator_elem.text:
-            authors = clean_text(creator_elem.text)
-
-        papers.append(
-            {
-                "id": arxiv_id,
-                "title": title,
-                "abstract": description,
-                "authors": authors,
-                "category": category,
-                "url": f"https://arxiv.org/abs/{arxiv_id}",
-                "pdf": f"https://arxiv.org/pdf/{arxiv_id}.pdf",
-            }
-        )
+        authors = clean_text(fields.get(DC_CREATOR) or "")
+
+        yield {
+            "id": arxiv_id,
+            "title": title,
+            "abstract": description,
+            "authors": authors,
+            "category": category,
+            "url": f"https://arxiv.org/abs/{arxiv_id}",
+            "pdf": f"https://arxiv.org/pdf/{arxiv_id}.pdf",
+        }
+
+
+def parse_atom(xml_content: bytes, categories: list[str]) -> Iterator[dict]:
+    """Parse arXiv API Atom XML, yielding one paper dict per entry."""
+    wanted = set(categories)
+    for entry in iter_items(xml_content, f"{ATOM}entry", f"{ATOM}feed"):
+        fields = {}
+        authors = []
+        terms = []
+        for child in entry:
+            if child.tag == f"{ATOM}author":
+                authors.append(clean_text(child.findtext(f"{ATOM}name") or ""))
+            elif child.tag == ARXIV_PRIMARY:
+                terms.insert(0, child.get("term"))
+            elif child.tag == f"{ATOM}category":
+                terms.append(child.get("term"))
+            else:
+                fields.setdefault(child.tag, child.text)
+
+        # Entry <id> is the abs URL, e.g. http://arxiv.org/abs/2401.12345v1
+        arxiv_id = extract_arxiv_id(fields.get(f"{ATOM}id") or "")
+        if not arxiv_id:
+            continue
 
-    return papers
+        # Attribute the paper to the first requested category it belongs to,
+        # preferring its primary category
+        category = next((t for t in terms if t in wanted), categories[0])
+
+        yield {
+            "id": arxiv_id,
+            "title": clean_text(fields.get(f"{ATOM}title") or ""),
+            "abstract": clean_text(fields.get(f"{ATOM}summary") or ""),
+            "authors": ", ".join(authors),
+            "category": category,
+            "url": f"https://arxiv.org/abs/{arxiv_id}",
+            "pdf": f"https://arxiv.org/pdf/{arxiv_id}.pdf",
+        }
 
 
-def fetch_category(category: str) -> list[dict]:
+def fetch_category(category: str, use_cache: bool = True) -> list[dict]:
     """Fetch all new papers for a category."""
     try:
-        xml_content = fetch_rss(category)
-        return parse_rss(xml_content, category)
+        return fetch_parsed(
+            rss_url(category),
+            category,
+            lambda content: parse_rss(content, category),
+            use_cache,
+        )
     except Exception as e:
         print(f"Warning: Failed to fetch {category}: {e}", file=sys.stderr)
         return []
 
 
+def fetch_combined(categories: list[str], use_cache: bool = True) -> list[dict]:
+    """Fetch recent papers for all categories with a single API request."""
+    try:
+        return fetch_parsed(
+            api_url(categories),
+            "api_" + "+".join(sorted(categories)),
+            lambda content: parse_atom(content, categories),
+            use_cache,
+        )
+    except Exception as e:
+        print(f"Warning: Failed to fetch {' '.join(categories)}: {e}", file=sys.stderr)
+        return []
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Fetch arXiv papers from RSS feeds",
@@ -112,6 +348,8 @@ Examples:
     %(prog)s quant-ph
     %(prog)s quant-ph cond-mat.str-el --output today.json
     %(prog)s quant-ph --titles-only
+    %(prog)s quant-ph --no-cache
+    %(prog)s quant-ph cond-mat.str-el physics.comp-ph --combined
 
 Common categories:
     quant-ph          Quantum Physics
@@ -128,21 +366,37 @@ Common categories:
         action="store_true",
         help="Output only id, title, url (for first pass)",
     )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help=f"Always re-download feeds instead of using {CACHE_DIR}",
+    )
+    parser.add_argument(
+        "--combined",
+        action="store_true",
+        help="Fetch all categories in one arXiv API query instead of one RSS "
+        "feed each (returns the latest submissions, not just today's)",
+    )
 
     args = parser.parse_args()
 
-    all_papers = []
-    seen_ids = set()
-
-    for category in args.categories:
-        papers = fetch_category(category)
+    if args.combined:
+        results = [fetch_combined(args.categories, use_cache=not args.no_cache)]
+    else:
+        # Fetches are network-bound, so run them concurrently
+        with ThreadPoolExecutor(max_workers=min(8, len(args.categories))) as executor:
+            fetch = partial(fetch_category, use_cache=not args.no_cache)
+            results = list(executor.map(fetch, args.categories))
+
+    # Dedup by ID, keeping the first occurrence (dicts preserve insertion order)
+    unique = {}
+    for papers in results:
         for paper in papers:
-            if paper["id"] not in seen_ids:
-                seen_ids.add(paper["id"])
-                all_papers.append(paper)
+            unique.setdefault(paper["id"], paper)
+    all_papers = list(unique.values())
 
     # Sort by ID (newer papers have higher IDs)
-    all_papers.sort(key=lambda p: p["id"], reverse=True)
+    all_papers.sort(key=itemgetter("id"), reverse=True)
 
     if args.titles_only:
         all_papers = [
@@ -156,17 +410,24 @@ Common categories:
         "papers": all_papers,
     }
 
-    json_str = json.dumps(output, indent=2, ensure_ascii=False)
-
+    # Stream straight to the destination rather than building the string first
     if args.output:
         # Ensure parent directory exists
         output_path = Path(args.output)
         output_path.parent.mkdir(parents=True, exist_ok=True)
-        with open(output_path, "w") as f:
-            f.write(json_str)
+        if orjson is not None:
+            output_path.write_bytes(orjson.dumps(output, option=orjson.OPT_INDENT_2))
+        else:
+            with open(output_path, "w") as f:
+                json.dump(output, f, indent=2, ensure_ascii=False)
         print(f"Wrote {len(all_papers)} papers to {args.output}", file=sys.stderr)
+    elif orjson is not None:
+        sys.stdout.buffer.write(
+            orjson.dumps(output, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE)
+        )
     else:
-        print(json_str)
+        json.dump(output, sys.stdout, indent=2, ensure_ascii=False)
+        sys.stdout.write("\n")
 
 
 if __name__ == "__main__":
@@ -11,17 +11,46 @@ Usage:
 import argparse
 import json
 import sys
+from functools import lru_cache
+from itertools import chain
 from pathlib import Path
+from string import Template
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
-def load_json(path: str) -> dict:
+
+# Templates and research_interests.md are memoized by resolved path so
+# repeated prompt builds in one process don't re-read them. Data and filter
+# files are always read fresh: they get rewritten between pipeline passes.
+@lru_cache(maxsize=32)
+def _read_text(path: Path) -> str:
     with open(path) as f:
-        return json.load(f)
+        return f.read()
 
 
 def load_text(path: str) -> str:
+    return _read_text(Path(path).resolve())
+
+
+def load_json(path: str) -> dict:
+    if orjson is not None:
+        with open(path, "rb") as f:
+            return orjson.loads(f.read())
     with open(path) as f:
-        return f.read()
+        return json.load(f)
+
+
+def dump_json(obj, compact: bool = False) -> str:
+    """JSON text for embedding in a prompt, indented unless `compact`."""
+    if orjson is not None:
+        option = 0 if compact else orjson.OPT_INDENT_2
+        return orjson.dumps(obj, option=option).decode("utf-8")
+    if compact:
+        return json.dumps(obj, separators=(",", ":"), ensure_ascii=False)
+    return json.dumps(obj, indent=2, ensure_ascii=False)
 
 
 def prepare_title_filter(data_path: str, base_dir: Path) -> str:
@@ -36,13 +65,12 @@ def prepare_title_filter(data_path: str, base_dir: Path) -> str:
         for p in data["papers"]
     ]
 
-    titles_json = json.dumps(titles, indent=None)  # Compact JSON
-
-    prompt = template.replace("{INTERESTS}", interests)
-    prompt = prompt.replace("{TITLES_JSON}", titles_json)
-    prompt = prompt.replace("{DATE}", data["date"])
+    titles_json = dump_json(titles, compact=True)
 
-    return prompt
+    # Single substitution pass; safe_substitute leaves any other "$" untouched
+    return Template(template).safe_substitute(
+        INTERESTS=interests, TITLES_JSON=titles_json, DATE=data["date"]
+    )
 
 
 def prepare_abstract_review(
@@ -60,19 +88,19 @@ def prepare_abstract_review(
         filter_data = load_json(filter_ids_path)
         # Accept either {"tier1": [...], "tier2": [...]} or just [...]
         if isinstance(filter_data, dict):
-            keep_ids = set(filter_data.get("tier1", []) + filter_data.get("tier2", []))
+            keep_ids = frozenset(
+                chain(filter_data.get("tier1", ()), filter_data.get("tier2", ()))
+            )
         else:
-            keep_ids = set(filter_data)
+            keep_ids = frozenset(filter_data)
         papers = [p for p in papers if p["id"] in keep_ids]
 
     # Include full info for abstract review
-    papers_json = json.dumps(papers, indent=2)
-
-    prompt = template.replace("{INTERESTS}", interests)
-    prompt = prompt.replace("{PAPERS_JSON}", papers_json)
-    prompt = prompt.replace("{DATE}", data["date"])
+    papers_json = dump_json(papers)
 
-    return prompt
+    return Template(template).safe_substitute(
+        INTERESTS=interests, PAPERS_JSON=papers_json, DATE=data["date"]
+    )
 
 
 def main():
@@ -98,7 +126,9 @@ def main():
     else:
         prompt = prepare_abstract_review(args.data, args.filter_ids, args.base_dir)
 
-    print(prompt)
+    # Prompts can be several MB; write the encoded bytes in one go
+    sys.stdout.buffer.write(prompt.encode("utf-8"))
+    sys.stdout.buffer.write(b"\n")
 
 
 if __name__ == "__main__":